@@ -1,7 +1,9 @@
 import pygame
+import os
 import sys
 import random
 import math
+from collections import deque
 from enum import Enum
 
 # Initialize Pygame
@@ -15,6 +17,13 @@ GRID_SIZE = 20
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
 GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
 FPS = 60
+WIN_LEVEL = 5
+
+# Level layouts
+LEVELS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "levels.txt")
+SPAWN_CLEARANCE = 5  # Cells around the start position kept free of walls
+HEAD_CLEARANCE = 3  # Moves ahead of the head kept free on a level change
 
 # Colors
 BACKGROUND = (15, 56, 15)  # Dark green
@@ -142,13 +151,23 @@ class Food:
         self.sparkle_timer = 0
         self.spawn()
 
-    def spawn(self, snake_body=None, obstacles=None):
+    def spawn(self, snake_body=None, obstacles=None, free_cells=None):
         # Generate random position
         if snake_body is None:
             snake_body = []
         if obstacles is None:
             obstacles = []
 
+        # Pick straight from the level's precomputed free cells when known
+        if free_cells is not None:
+            occupied = set(snake_body) | set(obstacles)
+            candidates = [cell for cell in free_cells if cell not in occupied]
+            if not candidates:
+                return False
+            self.position = random.choice(candidates)
+            self.spawn_time = pygame.time.get_ticks()
+            return True
+
         # Keep trying until we find a valid position
         while True:
             x = random.randint(0, GRID_WIDTH - 1)
@@ -158,7 +177,7 @@ class Food:
             # Check if position is not on snake or obstacles
             if (self.position not in snake_body) and (self.position not in obstacles):
                 self.spawn_time = pygame.time.get_ticks()
-                break
+                return True
 
     def update(self, dt):
         # Update sparkle animation
@@ -194,31 +213,207 @@ class Food:
             pygame.draw.circle(screen, sparkle_color, pos, 2)
 
 
+def flood_fill(walls, start, max_distance=None):
+    # Breadth-first search over the wrapping grid, mapping each reachable
+    # cell to its distance (in moves) from the start cell
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if max_distance is not None and distances[(x, y)] >= max_distance:
+            continue
+        for dx, dy in (direction.value for direction in Direction):
+            cell = ((x + dx) % GRID_WIDTH, (y + dy) % GRID_HEIGHT)
+            if cell not in walls and cell not in distances:
+                distances[cell] = distances[(x, y)] + 1
+                queue.append(cell)
+    return distances
+
+
+def in_spawn_zone(cell):
+    x, y = cell
+    return abs(x - GRID_WIDTH//2) <= SPAWN_CLEARANCE and \
+        abs(y - GRID_HEIGHT//2) <= SPAWN_CLEARANCE
+
+
+class LevelLayout:
+    def __init__(self, level, walls):
+        self.level = level
+        self.walls = frozenset(walls)
+        self.free_cells = tuple((x, y) for y in range(GRID_HEIGHT)
+                                for x in range(GRID_WIDTH)
+                                if (x, y) not in self.walls)
+
+        # Distances from the snake's start cell to every reachable cell
+        start = (GRID_WIDTH // 2, GRID_HEIGHT // 2)
+        self.distance_map = flood_fill(self.walls, start)
+
+    def is_connected(self):
+        return len(self.distance_map) == len(self.free_cells)
+
+
+class LevelEngine:
+    # Number of arguments taken by each command in the levels file
+    COMMANDS = {"LEVEL": 1, "P": 2, "H": 3, "V": 3, "R": 4, "BOX": 4}
+
+    def __init__(self, path=LEVELS_FILE, max_level=WIN_LEVEL - 1):
+        self.layouts = {}
+        self.definitions = {}
+        if os.path.exists(path):
+            with open(path) as levels_file:
+                self.definitions = self.parse(levels_file.read())
+
+        # Precompute every playable level up front so level changes are a
+        # lookup (reaching WIN_LEVEL ends the game)
+        for level in range(1, max_level + 1):
+            self.get_layout(level)
+
+    def parse(self, text):
+        # Each "LEVEL n" line starts a layout, the shape lines after it
+        # add walls to it. Anything after "#" is a comment.
+        definitions = {}
+        walls = None
+        for line_number, line in enumerate(text.splitlines(), 1):
+            tokens = line.split("#", 1)[0].split()
+            if not tokens:
+                continue
+
+            command = tokens[0].upper()
+            if command not in self.COMMANDS:
+                raise ValueError(
+                    f"levels file line {line_number}: unknown command {tokens[0]!r}")
+            try:
+                numbers = [int(token) for token in tokens[1:]]
+            except ValueError:
+                raise ValueError(
+                    f"levels file line {line_number}: arguments must be integers") from None
+            if len(numbers) != self.COMMANDS[command]:
+                raise ValueError(
+                    f"levels file line {line_number}: {command} takes "
+                    f"{self.COMMANDS[command]} arguments")
+
+            if command == "LEVEL":
+                if numbers[0] < 1:
+                    raise ValueError(
+                        f"levels file line {line_number}: level numbers start at 1")
+                walls = definitions.setdefault(numbers[0], set())
+                continue
+            if walls is None:
+                raise ValueError(
+                    f"levels file line {line_number}: shape before any LEVEL")
+
+            # Reject shapes that would come out empty or malformed
+            if command in ("H", "V") and numbers[1] > numbers[2]:
+                raise ValueError(
+                    f"levels file line {line_number}: {command} range runs backwards")
+            if command in ("R", "BOX"):
+                min_size = 3 if command == "BOX" else 1
+                if numbers[2] < min_size or numbers[3] < min_size:
+                    raise ValueError(
+                        f"levels file line {line_number}: {command} width and "
+                        f"height must be at least {min_size}")
+
+            cells = self.shape_cells(command, numbers)
+            for x, y in cells:
+                if not (0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT):
+                    raise ValueError(
+                        f"levels file line {line_number}: cell {(x, y)} is off the grid")
+
+            # A shape hidden entirely inside earlier walls is a mistake
+            if walls.issuperset(cells):
+                raise ValueError(
+                    f"levels file line {line_number}: {command} adds no new walls")
+            walls.update(cells)
+
+        return definitions
+
+    def shape_cells(self, command, numbers):
+        if command == "P":
+            # Single block
+            x, y = numbers
+            return [(x, y)]
+        if command == "H":
+            # Horizontal wall on row y from x0 to x1
+            y, x0, x1 = numbers
+            return [(x, y) for x in range(x0, x1 + 1)]
+        if command == "V":
+            # Vertical wall on column x from y0 to y1
+            x, y0, y1 = numbers
+            return [(x, y) for y in range(y0, y1 + 1)]
+
+        x, y, width, height = numbers
+        if command == "R":
+            # Solid rectangle
+            return [(x + i, y + j) for i in range(width) for j in range(height)]
+
+        # BOX: hollow rectangle with a doorway in the middle of each side
+        border = [(x + i, y) for i in range(width)] + \
+            [(x + i, y + height - 1) for i in range(width)] + \
+            [(x, y + j) for j in range(height)] + \
+            [(x + width - 1, y + j) for j in range(height)]
+        doors = {(x + width//2, y), (x + width//2, y + height - 1),
+                 (x, y + height//2), (x + width - 1, y + height//2)}
+        return [cell for cell in border if cell not in doors]
+
+    def get_layout(self, level):
+        if level not in self.layouts:
+            if level in self.definitions:
+                layout = LevelLayout(level, self.definitions[level])
+                self.validate(layout)
+            else:
+                layout = self.generate_layout(level)
+            self.layouts[level] = layout
+        return self.layouts[level]
+
+    def validate(self, layout):
+        # Keep the start area clear and every free cell reachable
+        if any(in_spawn_zone(cell) for cell in layout.walls):
+            raise ValueError(
+                f"level {layout.level}: walls block the snake's start area")
+        if not layout.is_connected():
+            raise ValueError(
+                f"level {layout.level}: walls cut off part of the garden")
+
+    def generate_layout(self, level):
+        # Scatter single blocks for levels the file doesn't describe
+        num_obstacles = min(level * 2, 10)
+        candidates = [(x, y) for x in range(2, GRID_WIDTH - 2)
+                      for y in range(2, GRID_HEIGHT - 2)
+                      if not in_spawn_zone((x, y))]
+
+        # Retry until no free cell is walled off
+        while True:
+            layout = LevelLayout(level, random.sample(candidates, num_obstacles))
+            if layout.is_connected():
+                return layout
+
+
 class Obstacle:
-    def __init__(self, level=1):
-        self.positions = []
-        self.generate_obstacles(level)
+    def __init__(self, levels, level=1):
+        self.levels = levels
+        self.load_level(level)
 
-    def generate_obstacles(self, level):
-        self.positions = []
+    def load_level(self, level, occupied=(), head=None, direction=None):
+        # Layouts are precomputed, so switching level is just a lookup
+        self.layout = self.levels.get_layout(level)
 
-        # Generate more obstacles as level increases
-        num_obstacles = min(level * 2, 10)
+        # Never drop a wall onto the snake mid-game
+        cleared = set(occupied)
 
-        for _ in range(num_obstacles):
-            while True:
-                x = random.randint(2, GRID_WIDTH - 3)
-                y = random.randint(2, GRID_HEIGHT - 3)
-                obstacle = (x, y)
+        # Nor just ahead of its head, so the player has time to react
+        if head is not None:
+            dx, dy = direction.value
+            ahead = ((head[0] + dx) % GRID_WIDTH, (head[1] + dy) % GRID_HEIGHT)
+            cleared.update(flood_fill(frozenset(), ahead, HEAD_CLEARANCE))
 
-                # Make sure obstacle is not too close to center
-                if abs(x - GRID_WIDTH//2) > 5 or abs(y - GRID_HEIGHT//2) > 5:
-                    self.positions.append(obstacle)
-                    break
+        self.positions = self.layout.walls.difference(cleared)
 
     def get_positions(self):
         return self.positions
 
+    def get_free_cells(self):
+        return self.layout.free_cells
+
 # ============================================
 # MODULE 3: Game Class (Main Controller)
 # ============================================
@@ -234,7 +429,8 @@ class Game:
         self.state = GameState.MENU
         self.snake = Snake()
         self.food = Food()
-        self.obstacle = Obstacle(1)
+        self.levels = LevelEngine()
+        self.obstacle = Obstacle(self.levels, 1)
         self.level = 1
         self.high_score = 0
         self.game_over_timer = 0
@@ -280,9 +476,10 @@ class Game:
 
     def reset_game(self):
         self.snake.reset()
-        self.food.spawn(self.snake.get_body(), self.obstacle.get_positions())
         self.level = 1
-        self.obstacle.generate_obstacles(self.level)
+        self.obstacle.load_level(self.level)
+        self.food.spawn(self.snake.get_body(), self.obstacle.get_positions(),
+                        self.obstacle.get_free_cells())
         self.game_over_timer = 0
 
     def check_collisions(self):
@@ -296,19 +493,26 @@ class Game:
             # Play sound
             self.eat_sound.play()
 
-            # Spawn new food
-            self.food.spawn(self.snake.get_body(),
-                            self.obstacle.get_positions())
-
             # Level up every 5 foods
             if self.snake.foods_eaten % 5 == 0:
                 self.level += 1
-                self.obstacle.generate_obstacles(self.level)
+
+                # Reaching the win level ends the game, so it has no layout
+                if self.level < WIN_LEVEL:
+                    self.obstacle.load_level(self.level, self.snake.get_body(),
+                                             self.snake.get_head_position(),
+                                             self.snake.next_direction)
 
             # Update high score
             if self.snake.score > self.high_score:
                 self.high_score = self.snake.score
 
+            # Spawn new food, the round ends if there's no room left for it
+            if not self.food.spawn(self.snake.get_body(),
+                                   self.obstacle.get_positions(),
+                                   self.obstacle.get_free_cells()):
+                return True
+
         # Check obstacle collision
         if self.snake.get_head_position() in self.obstacle.get_positions():
             return True
@@ -537,7 +741,7 @@ class Game:
                          high_score_text.get_width()//2, 240))
 
         # Check if player won (reached level 5)
-        if self.level >= 5:
+        if self.level >= WIN_LEVEL:
             win_text = self.font.render(
                 "You Mastered the Magical Garden!", True, HIGHLIGHT_COLOR)
             self.screen.blit(win_text, (SCREEN_WIDTH//2 -
@@ -632,7 +836,7 @@ class Game:
                     self.state = GameState.GAME_OVER
 
                 # Check for win condition (level 5)
-                if self.level >= 5:
+                if self.level >= WIN_LEVEL:
                     self.game_over_timer = pygame.time.get_ticks()
                     self.state = GameState.GAME_OVER
 